@@ -1,3 +1,14 @@
+import os
+
+# Socket.IO runs on eventlet greenlets; override with SOCKETIO_ASYNC_MODE
+SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'eventlet')
+
+# The gunicorn eventlet worker patches blocking I/O before importing the app;
+# the dev server (python app.py) has to do it itself, before requests loads
+if __name__ == '__main__' and SOCKETIO_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
 from search_utils import (
     google_search,
     redact_with_gemini,
@@ -13,7 +24,6 @@ from search_utils import (
 import sys
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import os
 import uuid
 import string
 import random
@@ -25,6 +35,23 @@ import time
 import threading
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    class OrjsonPacketJSON:
+        """json-module stand-in so Socket.IO packets are encoded with orjson"""
+
+        @staticmethod
+        def dumps(obj, *args, **kwargs):
+            # python-socketio passes separators=; orjson is always compact
+            return orjson.dumps(obj).decode()
+
+        loads = staticmethod(orjson.loads)
+
+    SOCKETIO_JSON = OrjsonPacketJSON
+except ImportError:
+    SOCKETIO_JSON = None  # python-socketio falls back to the stdlib json
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -32,12 +59,16 @@ load_dotenv()
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Optional Redis/RabbitMQ URL so emits from other processes reach clients
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    async_mode=SOCKETIO_ASYNC_MODE,
+                    json=SOCKETIO_JSON,
+                    message_queue=os.environ.get('SOCKETIO_MESSAGE_QUEUE'))
 
-# Configure logging
+# Configure logging (set LOG_LEVEL=DEBUG to trace socket handlers)
 logging.basicConfig(
     filename='app.log',
-    level=logging.DEBUG,
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s %(levelname)s %(name)s %(threadName)s : %(message)s'
 )
 
@@ -50,19 +81,43 @@ lobbies = {}  # Store active lobbies
 players = {}  # Store player sessions
 user_socket_map = {}     # userId -> sid
 socket_user_map = {}     # sid -> userId
+socket_lobby_map = {}    # sid -> lobbyId the socket subscribed to
 
 # Map lobbyCode to lobbyId for quick lookup
 lobby_code_map = {}
 
-# Track active timer threads
-active_timer_threads = {}
+# Chat history rides along in every lobby:state broadcast, so keep it short
+CHAT_HISTORY_LIMIT = 100
+
+# Per-lobby locks guarding read-modify-write of round and score state.
+# Kept outside the lobby dicts because those are serialized to clients.
+lobby_locks = {}
+
+# Lobbies with a running round timer; one shared task ticks them all
+active_round_timers = set()
+_round_timer_task = None
+_round_timer_lock = threading.Lock()
 
-# Helper to generate a 6-char alphanumeric code (upper/lowercase + numbers)
+# Lobbies with no connected player for this long are swept. Disconnects
+# mid-game only mark players offline, so nothing else ever frees them.
+LOBBY_IDLE_TTL = int(os.environ.get('LOBBY_IDLE_TTL', 1800))
+LOBBY_SWEEP_INTERVAL = 60
+lobby_idle_since = {}  # lobbyId -> monotonic time it was first seen idle
+_lobby_sweeper_task = None
+_lobby_sweeper_lock = threading.Lock()
+
+# Helper to generate a 6-char alphanumeric code (upper/lowercase + numbers).
+# Codes are the only key to a private lobby, so draw them from the OS CSPRNG.
+LOBBY_CODE_CHARS = string.ascii_letters + string.digits
+_system_random = random.SystemRandom()
 
 
 def generate_lobby_code(length=6):
-    chars = string.ascii_letters + string.digits
-    return ''.join(random.choices(chars, k=length))
+    """Generate a lobby code that is not already in use"""
+    while True:
+        lobby_code = ''.join(_system_random.choices(LOBBY_CODE_CHARS, k=length))
+        if lobby_code not in lobby_code_map:
+            return lobby_code
 
 # Helper to generate a unique user ID for a room
 
@@ -81,6 +136,13 @@ def generate_user_id(lobby_id):
         else:
             return user_id
 
+def get_lobby_lock(lobby_id):
+    """Return the lock for a lobby, creating it on first use"""
+    lock = lobby_locks.get(lobby_id)
+    if lock is None:
+        lock = lobby_locks.setdefault(lobby_id, threading.Lock())
+    return lock
+
 # Helper for socket connections
 
 
@@ -112,48 +174,124 @@ def get_cooldown_remaining(round_state):
     return max(0, int(remaining))
 
 
-def timer_broadcast_thread(lobby_id):
-    """Background thread that broadcasts timer updates every second"""
-    print(f"[Timer] Started timer thread for lobby {lobby_id}")
+def remove_lobby(lobby_id):
+    """Drop a lobby along with everything indexed by its id or code"""
+    lobby = lobbies.pop(lobby_id, None)
+    if lobby:
+        lobby_code_map.pop(lobby['lobbyCode'], None)
+        # Player ids are only unique per lobby, so only drop sockets that
+        # are still subscribed to this one
+        for player in lobby['players']:
+            sid = user_socket_map.get(player['playerId'])
+            if sid is not None and socket_lobby_map.get(sid) == lobby_id:
+                user_socket_map.pop(player['playerId'], None)
+                socket_user_map.pop(sid, None)
+                socket_lobby_map.pop(sid, None)
+    lobby_locks.pop(lobby_id, None)
+    lobby_idle_since.pop(lobby_id, None)
+    active_round_timers.discard(lobby_id)
+
+
+def sweep_idle_lobbies(now=None):
+    """Remove lobbies idle for LOBBY_IDLE_TTL; returns how many were removed"""
+    now = time.monotonic() if now is None else now
+    removed = 0
+    for lobby_id, lobby in list(lobbies.items()):
+        if any(p.get('isConnected') for p in lobby['players']):
+            lobby_idle_since.pop(lobby_id, None)
+            continue
+        if now - lobby_idle_since.setdefault(lobby_id, now) >= LOBBY_IDLE_TTL:
+            remove_lobby(lobby_id)
+            removed += 1
+    return removed
+
+
+def lobby_sweeper_loop():
+    """Background task that periodically sweeps idle lobbies"""
+    while True:
+        socketio.sleep(LOBBY_SWEEP_INTERVAL)
+        removed = sweep_idle_lobbies()
+        if removed:
+            app.logger.info("Swept %s idle lobbies", removed)
 
-    while lobby_id in lobbies:
-        lobby = lobbies.get(lobby_id)
-        if not lobby or not lobby.get('roundState'):
-            break
 
-        round_state = lobby['roundState']
-        if not round_state.get('isActive'):
-            break
+def start_lobby_sweeper():
+    """Start the idle-lobby sweeper the first time a lobby is created"""
+    global _lobby_sweeper_task
+    with _lobby_sweeper_lock:
+        if _lobby_sweeper_task is None:
+            _lobby_sweeper_task = socketio.start_background_task(
+                lobby_sweeper_loop)
 
-        time_remaining = get_current_round_time_remaining(round_state)
-        cooldown_remaining = get_cooldown_remaining(round_state)
 
-        # Broadcast timer sync
-        socketio.emit('round:timer_sync', {
-            'timeRemaining': time_remaining,
-            'cooldownRemaining': cooldown_remaining,
-            'roundNumber': round_state.get('roundNumber', 1)
-        }, room=lobby_id)
+def tick_round_timer(lobby_id):
+    """Broadcast one timer update; returns False once the round is over"""
+    lobby = lobbies.get(lobby_id)
+    if not lobby or not lobby.get('roundState'):
+        return False
+
+    round_state = lobby['roundState']
+    if not round_state.get('isActive'):
+        return False
 
-        # Check if round should end
-        if time_remaining <= 0:
+    time_remaining = get_current_round_time_remaining(round_state)
+    cooldown_remaining = get_cooldown_remaining(round_state)
+
+    # Broadcast timer sync
+    socketio.emit('round:timer_sync', {
+        'timeRemaining': time_remaining,
+        'cooldownRemaining': cooldown_remaining,
+        'roundNumber': round_state.get('roundNumber', 1)
+    }, room=lobby_id)
+
+    # Check if round should end (a last correct guess may have ended it first)
+    if time_remaining <= 0:
+        with get_lobby_lock(lobby_id):
+            was_active = round_state.get('isActive')
             round_state['isActive'] = False
-            socketio.emit('round:ended', {
-                'reason': 'time_expired',
-                'roundNumber': round_state.get('roundNumber', 1),
-                'timeUsed': round_state['timeLimit'],
-                'message': 'Time expired'
-            }, room=lobby_id)
-            print(f"[Timer] Round ended for lobby {lobby_id}")
-            break
+        if not was_active:
+            return False
+        socketio.emit('round:ended', {
+            'reason': 'time_expired',
+            'roundNumber': round_state.get('roundNumber', 1),
+            'timeUsed': round_state['timeLimit'],
+            'message': 'Time expired'
+        }, room=lobby_id)
+        app.logger.info("[Timer] Round ended for lobby %s", lobby_id)
+        return False
+
+    return True
 
-        time.sleep(1)
 
-    # Clean up thread reference
-    if lobby_id in active_timer_threads:
-        del active_timer_threads[lobby_id]
+def round_timer_loop():
+    """Single background task that ticks every active round once a second"""
+    global _round_timer_task
+    app.logger.info("[Timer] Started round timer task")
+
+    while True:
+        for lobby_id in list(active_round_timers):
+            if not tick_round_timer(lobby_id):
+                active_round_timers.discard(lobby_id)
+                app.logger.info("[Timer] Timer stopped for lobby %s", lobby_id)
+
+        with _round_timer_lock:
+            if not active_round_timers:
+                _round_timer_task = None
+                break
 
-    print(f"[Timer] Timer thread stopped for lobby {lobby_id}")
+        socketio.sleep(1)
+
+    app.logger.info("[Timer] Round timer task stopped")
+
+
+def start_round_timer(lobby_id):
+    """Register a lobby with the shared timer task, starting it if idle"""
+    global _round_timer_task
+    with _round_timer_lock:
+        active_round_timers.add(lobby_id)
+        if _round_timer_task is None:
+            _round_timer_task = socketio.start_background_task(
+                round_timer_loop)
 
 
 # socket event handlers
@@ -167,20 +305,19 @@ def on_connect():
 @socketio.on("disconnect")
 def on_disconnect():
     sid = request.sid
-    user_id = socket_user_map.get(sid)
+    user_id = socket_user_map.pop(sid, None)
 
     # Clean up socket mappings
     if user_id:
         user_socket_map.pop(user_id, None)
-        socket_user_map.pop(sid, None)
 
         # Handle player disconnect based on lobby state
-        for lobby_id, lobby in list(lobbies.items()):
-            player_found = False
+        lobby_id = socket_lobby_map.pop(sid, None)
+        lobby = lobbies.get(lobby_id)
+        if lobby:
             for i, player in enumerate(lobby['players']):
                 if player['playerId'] == user_id:
                     player_name = player['playerName']
-                    player_found = True
 
                     # Differentiate between lobby (waiting) and in-game disconnect
                     if lobby['status'] == 'waiting':
@@ -199,9 +336,7 @@ def on_disconnect():
                             }, room=lobby_id)
                         else:
                             # No players left, clean up the lobby
-                            lobby_code = lobby['lobbyCode']
-                            del lobbies[lobby_id]
-                            lobby_code_map.pop(lobby_code, None)
+                            remove_lobby(lobby_id)
                             app.logger.info(
                                 f"Lobby {lobby_id} cleaned up (no players remaining)")
 
@@ -220,9 +355,6 @@ def on_disconnect():
 
                     break
 
-            if player_found:
-                break
-
     app.logger.info(f"Socket disconnected: {sid}")
 
 
@@ -246,6 +378,7 @@ def on_lobby_join(data):
     # Track sockets for private messages
     user_socket_map[user_id] = request.sid
     socket_user_map[request.sid] = user_id
+    socket_lobby_map[request.sid] = lobby_id
 
     # Join the lobby room
     join_room(lobby_id)
@@ -264,16 +397,14 @@ def on_lobby_join(data):
                 f"Player {player_name} ({user_id}) connected to lobby {lobby_id}")
             break
 
-    # Send current state to just this socket
-    emit("lobby:state", {"lobby": lobbies[lobby_id]})
+    # Broadcast updated state to everyone in the lobby; this socket has
+    # already joined the room, so it receives the same (single) payload
+    emit_lobby_state(lobby_id)
 
     # Send chat history
     emit("chat:history", {
          "messages": lobbies[lobby_id].get('chatHistory', [])})
 
-    # Broadcast updated state to everyone in the lobby
-    emit_lobby_state(lobby_id)
-
     # Notify others if this is a reconnection or existing player connecting
     if player_found and player_name:
         socketio.emit("lobby:player_joined", {
@@ -319,9 +450,7 @@ def on_lobby_leave(data):
                         }, room=lobby_id)
                     else:
                         # Clean up empty lobby
-                        lobby_code = lobby['lobbyCode']
-                        del lobbies[lobby_id]
-                        lobby_code_map.pop(lobby_code, None)
+                        remove_lobby(lobby_id)
                         app.logger.info(
                             f"Lobby {lobby_id} cleaned up (no players remaining)")
                 else:
@@ -339,6 +468,7 @@ def on_lobby_leave(data):
         # Clean up socket mappings
         user_socket_map.pop(user_id, None)
         socket_user_map.pop(sid, None)
+        socket_lobby_map.pop(sid, None)
 
     leave_room(lobby_id)
 
@@ -346,7 +476,7 @@ def on_lobby_leave(data):
 # Debug ping/pong handlers for frontend socket testing
 @socketio.on("ping")
 def handle_ping(data):
-    app.logger.debug(f"[SocketIO] Received ping from frontend: {data}")
+    app.logger.debug("[SocketIO] Received ping from frontend: %s", data)
     emit("pong", {"msg": "pong from backend", "time": data.get("time")})
     emit("debug", "Ping event received and pong sent.")
 
@@ -383,6 +513,7 @@ def handle_chat_message(data):
     if 'chatHistory' not in lobby:
         lobby['chatHistory'] = []
     lobby['chatHistory'].append(chat_msg)
+    del lobby['chatHistory'][:-CHAT_HISTORY_LIMIT]
 
     # Broadcast to lobby
     socketio.emit("chat:message", chat_msg, room=lobby_id)
@@ -413,53 +544,113 @@ def handle_emote(data):
 
 # ============ Game WebSocket Handlers ============
 
+def perform_search_background(lobby_id, sid, search_query):
+    """Background task to run a searcher's query and send results back"""
+    try:
+        app.logger.debug("Performing Google search...")
+        results = google_search(search_query, num_results=5)
+        app.logger.debug("Google search returned: %s results", len(results))
+
+        # Increment search count
+        lobby = lobbies.get(lobby_id)
+        round_state = lobby.get('roundState') if lobby else None
+        if round_state:
+            with get_lobby_lock(lobby_id):
+                round_state['searchCount'] = round_state.get(
+                    'searchCount', 0) + 1
+
+        if not results:
+            app.logger.debug("WARNING: No results from Google search")
+            socketio.emit('search_result', {
+                'query': search_query,
+                'results': [],
+                'count': 0,
+                'valid': True,
+                'query_index': 0,
+                'message': 'Search completed but no results found'
+            }, room=sid)
+            return
+
+        # Transform results to include redaction indicators
+        results_with_indicators = []
+        for result in results:
+            results_with_indicators.append({
+                'title': result.get('title', ''),
+                'snippet': result.get('snippet', ''),
+                'link': result.get('link', ''),
+                'displayLink': result.get('displayLink', ''),
+                # TODO: Implement redaction logic
+                'redactedTerms': {'title': [], 'snippet': []}
+            })
+
+        app.logger.debug(
+            "Sending results with %s items", len(results_with_indicators))
+
+        # Send results back to searcher
+        socketio.emit('search_result', {
+            'query': search_query,
+            'results': results_with_indicators,
+            'count': len(results),
+            'valid': True,
+            'query_index': 0,
+            'message': f'Search completed: {len(results)} results'
+        }, room=sid)
+
+        app.logger.debug("Successfully emitted search_result")
+
+    except Exception as e:
+        app.logger.exception(
+            "[Background] Error in search for lobby %s", lobby_id)
+        socketio.emit('error', {'message': f'Search failed: {str(e)}'},
+                      room=sid)
+
+
 @socketio.on('searcher_make_search')
 def handle_searcher_make_search(data):
     """Searcher makes a search query"""
-    app.logger.debug(f"\n========== searcher_make_search ==========")
-    app.logger.debug(f"Request from: {request.sid}")
-    app.logger.debug(f"Data received: {data}")
+    app.logger.debug("\n========== searcher_make_search ==========")
+    app.logger.debug("Request from: %s", request.sid)
+    app.logger.debug("Data received: %s", data)
 
     try:
         # Note: frontend sends 'room_key'
         lobby_id = data.get('room_key', '').strip()
         search_query = data.get('query', '').strip()
 
-        app.logger.debug(f"Lobby ID: {lobby_id}")
-        app.logger.debug(f"Search query: {search_query}")
+        app.logger.debug("Lobby ID: %s", lobby_id)
+        app.logger.debug("Search query: %s", search_query)
 
-        if lobby_id not in lobbies:
-            app.logger.debug(f"ERROR: Lobby not found")
+        lobby = lobbies.get(lobby_id)
+        if lobby is None:
+            app.logger.debug("ERROR: Lobby not found")
             emit('error', {'message': 'Lobby not found'})
             return
 
-        lobby = lobbies[lobby_id]
-
         # Get topic and forbidden words from server state instead of client
         round_state = lobby.get('roundState')
         if not round_state:
-            app.logger.debug(f"ERROR: No active round found")
+            app.logger.debug("ERROR: No active round found")
             emit('error', {'message': 'No active round found'})
             return
 
         secret_topic = round_state.get('topic')
         forbidden_words = round_state.get('forbiddenWords', [])
 
-        app.logger.debug(f"Server-side Secret topic: {secret_topic}")
-        app.logger.debug(f"Server-side Forbidden words: {forbidden_words}")
+        app.logger.debug("Server-side Secret topic: %s", secret_topic)
+        app.logger.debug("Server-side Forbidden words: %s", forbidden_words)
 
         if not search_query:
-            app.logger.debug(f"ERROR: Empty search query")
+            app.logger.debug("ERROR: Empty search query")
             emit('error', {'message': 'Search query is required'})
             return
 
         # Validate query doesn't contain forbidden words
         validation_result = validate_query_logic(search_query, forbidden_words)
-        app.logger.debug(f"Validation result: {validation_result}")
+        app.logger.debug("Validation result: %s", validation_result)
 
         if not validation_result['valid']:
             app.logger.debug(
-                f"Query validation failed: {validation_result['violations']}")
+                "Query validation failed: %s", validation_result['violations'])
             emit('search_result', {
                 'query': search_query,
                 'results': [],
@@ -469,110 +660,64 @@ def handle_searcher_make_search(data):
             })
             return
 
-        # Perform search
-        app.logger.debug(f"Performing Google search...")
-        results = google_search(search_query, num_results=5)
-        app.logger.debug(f"Google search returned: {len(results)} results")
-
-        # Increment search count
-        if round_state:
-            round_state['searchCount'] = round_state.get('searchCount', 0) + 1
-
-        if not results:
-            app.logger.debug(f"WARNING: No results from Google search")
-            emit('search_result', {
-                'query': search_query,
-                'results': [],
-                'count': 0,
-                'valid': True,
-                'query_index': 0,
-                'message': 'Search completed but no results found'
-            })
-            return
-
-        # Transform results to include redaction indicators
-        results_with_indicators = []
-        for result in results:
-            results_with_indicators.append({
-                'title': result.get('title', ''),
-                'snippet': result.get('snippet', ''),
-                'link': result.get('link', ''),
-                'displayLink': result.get('displayLink', ''),
-                # TODO: Implement redaction logic
-                'redactedTerms': {'title': [], 'snippet': []}
-            })
-
-        app.logger.debug(
-            f"Sending results with {len(results_with_indicators)} items")
-
-        # Send results back to searcher
-        emit('search_result', {
-            'query': search_query,
-            'results': results_with_indicators,
-            'count': len(results),
-            'valid': True,
-            'query_index': 0,
-            'message': f'Search completed: {len(results)} results'
-        })
-
-        app.logger.debug(f"Successfully emitted search_result")
+        # Search off the handler so a slow Custom Search call doesn't hold it
+        socketio.start_background_task(
+            perform_search_background,
+            lobby_id,
+            request.sid,
+            search_query
+        )
 
     except Exception as e:
-        app.logger.error(f"CRITICAL ERROR in handle_searcher_make_search: {e}")
-        import traceback
-        traceback.print_exc()
+        app.logger.exception("CRITICAL ERROR in handle_searcher_make_search")
         try:
             emit('error', {'message': f'Search failed: {str(e)}'})
         except:
             app.logger.error(f"FAILED TO EMIT ERROR MESSAGE")
 
-    app.logger.debug(f"========== searcher_make_search END ==========\n")
+    app.logger.debug("========== searcher_make_search END ==========\n")
 
 
 @socketio.on('searcher_select_query')
 def handle_searcher_select_query(data):
     """Searcher selects which query result to send to guessers"""
-    app.logger.debug(f"\n========== searcher_select_query ==========")
-    app.logger.debug(f"Request from: {request.sid}")
-    app.logger.debug(f"Data received: {data}")
+    app.logger.debug("\n========== searcher_select_query ==========")
+    app.logger.debug("Request from: %s", request.sid)
+    app.logger.debug("Data received: %s", data)
 
     try:
         lobby_id = data.get('room_key', '').strip()
         query_index = data.get('query_index')
 
-        app.logger.debug(f"Lobby ID: {lobby_id}")
-        app.logger.debug(f"Query index: {query_index}")
+        app.logger.debug("Lobby ID: %s", lobby_id)
+        app.logger.debug("Query index: %s", query_index)
 
-        if lobby_id not in lobbies:
-            app.logger.debug(f"ERROR: Lobby not found")
+        lobby = lobbies.get(lobby_id)
+        if lobby is None:
+            app.logger.debug("ERROR: Lobby not found")
             emit('error', {'message': 'Lobby not found'})
             return
 
-        lobby = lobbies[lobby_id]
-
         # Notify searcher that query was selected
         emit('query_selected', {
             'query_index': query_index,
             'message': 'Query selected and sent to guessers'
         })
 
-        app.logger.debug(f"Notified searcher of selection")
+        app.logger.debug("Notified searcher of selection")
 
         # TODO: Send redacted results to guessers
         # This would require storing search results in lobby state
         # and implementing redaction logic
 
     except Exception as e:
-        app.logger.error(
-            f"CRITICAL ERROR in handle_searcher_select_query: {e}")
-        import traceback
-        traceback.print_exc()
+        app.logger.exception("CRITICAL ERROR in handle_searcher_select_query")
         try:
             emit('error', {'message': f'Failed to select query: {str(e)}'})
         except:
             app.logger.error(f"FAILED TO EMIT ERROR MESSAGE")
 
-    app.logger.debug(f"========== searcher_select_query END ==========\n")
+    app.logger.debug("========== searcher_select_query END ==========\n")
 
 
 # ============ Lobby Endpoints ============
@@ -590,8 +735,6 @@ def create_lobby():
 
     lobby_id = str(uuid.uuid4())
     lobby_code = generate_lobby_code()
-    while lobby_code in lobby_code_map:
-        lobby_code = generate_lobby_code()
 
     lobby = {
         'lobbyId': lobby_id,
@@ -607,6 +750,7 @@ def create_lobby():
     }
     lobbies[lobby_id] = lobby
     lobby_code_map[lobby_code] = lobby_id
+    start_lobby_sweeper()
 
     return jsonify({
         'lobbyId': lobby_id,
@@ -768,11 +912,10 @@ def start_game(lobby_id):
     """
     data = request.json
 
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
-
     if len(lobby['players']) < 2:
         return jsonify({'error': 'Need at least 2 players to start game'}), 400
 
@@ -880,10 +1023,9 @@ def perform_initial_search_background(lobby_id, user_id, topic, forbidden_words)
             }, room=searcher_sid)
             app.logger.info(f"[Background] Sent initial results to searcher")
 
-    except Exception as e:
-        app.logger.error(f"[Background] Error in initial search: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        app.logger.exception(
+            "[Background] Error in initial search for lobby %s", lobby_id)
 
 
 @app.route('/api/round/select-topic', methods=['POST'])
@@ -914,11 +1056,10 @@ def select_topic():
     if not all([lobby_id, user_id, topic, forbidden_words]):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
-
     # Verify user is the searcher
     searcher = None
     for player in lobby['players']:
@@ -929,36 +1070,34 @@ def select_topic():
     if not searcher:
         return jsonify({'error': 'Only the searcher can select a topic'}), 403
 
-    # Reset player round status
-    for p in lobby['players']:
-        p['hasGuessedCorrectly'] = False
-        p['guessCount'] = 0
-        p['roundScore'] = 0
-        p['roundBreakdown'] = None
-
-    # Initialize round state immediately
-    current_time = time.time()
-    lobby['roundState'] = {
-        'roundNumber': round_number,
-        'startTime': current_time,
-        'endTime': current_time + time_limit,
-        'timeLimit': time_limit,
-        'topic': topic,
-        'forbiddenWords': forbidden_words,
-        'searcherReady': True,
-        'lastResultSentAt': current_time,
-        'resultCooldown': 30,
-        'initialResultSent': False,  # Will be set to true after background search
-        'isActive': True,
-        'searchCount': 0
-    }
+    with get_lobby_lock(lobby_id):
+        # Reset player round status
+        for p in lobby['players']:
+            p['hasGuessedCorrectly'] = False
+            p['guessCount'] = 0
+            p['roundScore'] = 0
+            p['roundBreakdown'] = None
+
+        # Initialize round state immediately
+        current_time = time.time()
+        lobby['roundState'] = {
+            'roundNumber': round_number,
+            'startTime': current_time,
+            'endTime': current_time + time_limit,
+            'timeLimit': time_limit,
+            'topic': topic,
+            # Tuple once per round: the search_utils caches key on it as-is
+            'forbiddenWords': tuple(forbidden_words),
+            'searcherReady': True,
+            'lastResultSentAt': current_time,
+            'resultCooldown': 30,
+            'initialResultSent': False,  # Will be set to true after background search
+            'isActive': True,
+            'searchCount': 0
+        }
 
-    # Start timer broadcast thread
-    if lobby_id not in active_timer_threads:
-        timer_thread = threading.Thread(
-            target=timer_broadcast_thread, args=(lobby_id,), daemon=True)
-        timer_thread.start()
-        active_timer_threads[lobby_id] = timer_thread
+    # Start broadcasting timer updates for this round
+    start_round_timer(lobby_id)
 
     # Broadcast round started to all players
     socketio.emit('round:started', {
@@ -977,8 +1116,8 @@ def select_topic():
         forbidden_words
     )
 
-    print(
-        f"[Round] Started round {round_number} for lobby {lobby_id} with topic: {topic}")
+    app.logger.info("[Round] Started round %s for lobby %s with topic: %s",
+                    round_number, lobby_id, topic)
 
     # Return immediately without waiting for search results
     return jsonify({
@@ -1005,28 +1144,27 @@ def perform_redaction_and_broadcast_background(lobby_id, user_id, query, results
             f"[Background] Redaction completed, broadcasting to guessers")
 
         # Get lobby to access players
-        if lobby_id not in lobbies:
+        lobby = lobbies.get(lobby_id)
+        if lobby is None:
             app.logger.error(f"[Background] Lobby {lobby_id} not found")
             return
 
-        lobby = lobbies[lobby_id]
-
-        # Send redacted results to guessers
-        for player in lobby['players']:
-            if player['role'] == 'guesser':
-                guesser_sid = user_socket_map.get(player['playerId'])
-                if guesser_sid:
-                    socketio.emit('round:new_result', {
-                        'results': redacted_results,
-                        'timestamp': time.time()
-                    }, room=guesser_sid)
+        # Send redacted results to guessers: the payload is identical for
+        # all of them, so broadcast once to the lobby room minus the searcher
+        searcher_sids = [
+            user_socket_map[p['playerId']] for p in lobby['players']
+            if p['role'] == 'searcher' and p['playerId'] in user_socket_map
+        ]
+        socketio.emit('round:new_result', {
+            'results': redacted_results,
+            'timestamp': time.time()
+        }, room=lobby_id, skip_sid=searcher_sids or None)
 
         app.logger.info(f"[Background] Results sent to guessers")
 
-    except Exception as e:
-        app.logger.error(f"[Background] Error in redaction: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        app.logger.exception(
+            "[Background] Error in redaction for lobby %s", lobby_id)
 
 
 @app.route('/api/round/send-result', methods=['POST'])
@@ -1050,10 +1188,10 @@ def send_result():
     if not all([lobby_id, user_id, query]):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
     round_state = lobby.get('roundState')
 
     if not round_state or not round_state.get('isActive'):
@@ -1069,17 +1207,18 @@ def send_result():
     if not is_searcher:
         return jsonify({'error': 'Only the searcher can send results'}), 403
 
-    # Check cooldown
-    cooldown_remaining = get_cooldown_remaining(round_state)
+    # Check and claim the cooldown atomically so two sends can't both pass
+    with get_lobby_lock(lobby_id):
+        cooldown_remaining = get_cooldown_remaining(round_state)
+        if cooldown_remaining <= 0:
+            round_state['lastResultSentAt'] = time.time()
+
     if cooldown_remaining > 0:
         return jsonify({
             'error': f'Cooldown active. Wait {cooldown_remaining} seconds',
             'cooldownRemaining': cooldown_remaining
         }), 429
 
-    # Update cooldown timestamp immediately
-    round_state['lastResultSentAt'] = time.time()
-
     # Notify searcher of successful send and start cooldown immediately
     searcher_sid = user_socket_map.get(user_id)
     if searcher_sid:
@@ -1098,8 +1237,9 @@ def send_result():
         round_state['topic']
     )
 
-    print(
-        f"[Round] Searcher sent result to guessers in lobby {lobby_id}, cooldown started")
+    app.logger.info(
+        "[Round] Searcher sent result to guessers in lobby %s, cooldown started",
+        lobby_id)
 
     # Return immediately without waiting for redaction
     return jsonify({
@@ -1119,10 +1259,10 @@ def get_round_state(lobby_id):
         "cooldownRemaining": int
     }
     """
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
     round_state = lobby.get('roundState')
 
     if not round_state:
@@ -1150,10 +1290,10 @@ def get_round_results(lobby_id):
     """
     Get comprehensive results for the current/last round
     """
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
     round_state = lobby.get('roundState')
 
     # Calculate time used
@@ -1205,10 +1345,10 @@ def make_guess():
     if not all([lobby_id, user_id, guess]):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    if lobby_id not in lobbies:
+    lobby = lobbies.get(lobby_id)
+    if lobby is None:
         return jsonify({'error': 'Lobby not found'}), 404
 
-    lobby = lobbies[lobby_id]
     round_state = lobby.get('roundState')
 
     if not round_state or not round_state.get('isActive'):
@@ -1223,9 +1363,11 @@ def make_guess():
     if player['role'] != 'guesser':
         return jsonify({'error': 'Only guessers can guess'}), 403
 
-    player['guessCount'] = player.get('guessCount', 0) + 1
+    with get_lobby_lock(lobby_id):
+        player['guessCount'] = player.get('guessCount', 0) + 1
+        guess_count = player['guessCount']
 
-    # Check guess (case-insensitive or semantic)
+    # Check guess (case-insensitive or semantic); may call Gemini, so unlocked
     topic = round_state['topic']
 
     verification = verify_guess_with_gemini(guess, topic)
@@ -1233,80 +1375,89 @@ def make_guess():
     similarity_score = verification.get('similarity_score', 0.0)
 
     if is_correct:
-        player['hasGuessedCorrectly'] = True
-
-        # Calculate score
-        # Base: 100
-        # Speed: +1 per second remaining
-        # Efficiency: -10 per extra guess (max penalty 50)
-        # First Try: +100
-
-        time_remaining = get_current_round_time_remaining(round_state)
-        guess_count = player['guessCount']
-
-        base_score = 100
-        speed_bonus = max(0, time_remaining)
-        efficiency_penalty = min(50, (guess_count - 1) * 10)
-        first_try_bonus = 100 if guess_count == 1 else 0
-        # Up to 50 bonus points for semantic match
-        similarity_bonus = int(similarity_score * 50)
-
-        round_score = base_score + speed_bonus - \
-            efficiency_penalty + first_try_bonus + similarity_bonus
-
-        player['score'] += round_score
-        player['roundScore'] = round_score
-        player['roundBreakdown'] = {
-            'base': base_score,
-            'speed': speed_bonus,
-            'efficiency': -efficiency_penalty,
-            'firstTry': first_try_bonus,
-            'similarity': similarity_bonus
-        }
-
-        # Award points to searcher for speed (collaboration bonus)
-        searcher = next(
-            (p for p in lobby['players'] if p['role'] == 'searcher'), None)
-        if searcher:
-            searcher_bonus = max(0, int(time_remaining / 2))
-            searcher['score'] += searcher_bonus
-
-            # Update searcher round stats
-            if not searcher.get('roundBreakdown'):
-                searcher['roundBreakdown'] = {'collaboration': 0}
-            searcher['roundBreakdown']['collaboration'] = searcher['roundBreakdown'].get(
-                'collaboration', 0) + searcher_bonus
-            searcher['roundScore'] = searcher.get(
-                'roundScore', 0) + searcher_bonus
-
-        # Emit success event to this player
-        player_sid = user_socket_map.get(user_id)
-        if player_sid:
-            socketio.emit('round:guess_result', {
-                'correct': True,
-                'score': round_score,
-                'totalScore': player['score'],
-                'breakdown': player['roundBreakdown']
-            }, room=player_sid)
-
-        # Broadcast score update to everyone
-        emit_lobby_state(lobby_id)
-
-        # Check if all guessers are correct
-        all_guessers = [p for p in lobby['players'] if p['role'] == 'guesser']
-        all_correct = all(p.get('hasGuessedCorrectly', False)
-                          for p in all_guessers)
-
-        if all_correct:
-            round_state['isActive'] = False
-            time_used = int(time.time() - round_state['startTime'])
-            socketio.emit('round:ended', {
-                'reason': 'success',
-                'roundNumber': round_state.get('roundNumber', 1),
-                'timeUsed': time_used,
-                'message': 'All agents have identified the target!'
-            }, room=lobby_id)
-            print(f"[Round] Round ended (success) for lobby {lobby_id}")
+        with get_lobby_lock(lobby_id):
+            # A concurrent guess may already have scored or ended the round,
+            # or the searcher may have started a new one during verification
+            scored = (lobby.get('roundState') is round_state
+                      and round_state.get('isActive')
+                      and not player.get('hasGuessedCorrectly'))
+            if scored:
+                player['hasGuessedCorrectly'] = True
+
+                # Calculate score
+                # Base: 100
+                # Speed: +1 per second remaining
+                # Efficiency: -10 per extra guess (max penalty 50)
+                # First Try: +100
+
+                time_remaining = get_current_round_time_remaining(round_state)
+
+                base_score = 100
+                speed_bonus = max(0, time_remaining)
+                efficiency_penalty = min(50, (guess_count - 1) * 10)
+                first_try_bonus = 100 if guess_count == 1 else 0
+                # Up to 50 bonus points for semantic match
+                similarity_bonus = int(similarity_score * 50)
+
+                round_score = base_score + speed_bonus - \
+                    efficiency_penalty + first_try_bonus + similarity_bonus
+
+                player['score'] += round_score
+                player['roundScore'] = round_score
+                player['roundBreakdown'] = {
+                    'base': base_score,
+                    'speed': speed_bonus,
+                    'efficiency': -efficiency_penalty,
+                    'firstTry': first_try_bonus,
+                    'similarity': similarity_bonus
+                }
+
+                # Award points to searcher for speed (collaboration bonus)
+                searcher = next(
+                    (p for p in lobby['players'] if p['role'] == 'searcher'), None)
+                if searcher:
+                    searcher_bonus = max(0, int(time_remaining / 2))
+                    searcher['score'] += searcher_bonus
+
+                    # Update searcher round stats
+                    if not searcher.get('roundBreakdown'):
+                        searcher['roundBreakdown'] = {'collaboration': 0}
+                    searcher['roundBreakdown']['collaboration'] = searcher['roundBreakdown'].get(
+                        'collaboration', 0) + searcher_bonus
+                    searcher['roundScore'] = searcher.get(
+                        'roundScore', 0) + searcher_bonus
+
+                # Check if all guessers are correct
+                all_correct = all(p.get('hasGuessedCorrectly', False)
+                                  for p in lobby['players']
+                                  if p['role'] == 'guesser')
+                if all_correct:
+                    round_state['isActive'] = False
+                    time_used = int(time.time() - round_state['startTime'])
+
+        if scored:
+            # Emit success event to this player
+            player_sid = user_socket_map.get(user_id)
+            if player_sid:
+                socketio.emit('round:guess_result', {
+                    'correct': True,
+                    'score': round_score,
+                    'totalScore': player['score'],
+                    'breakdown': player['roundBreakdown']
+                }, room=player_sid)
+
+            # Broadcast score update to everyone
+            emit_lobby_state(lobby_id)
+
+            if all_correct:
+                socketio.emit('round:ended', {
+                    'reason': 'success',
+                    'roundNumber': round_state.get('roundNumber', 1),
+                    'timeUsed': time_used,
+                    'message': 'All agents have identified the target!'
+                }, room=lobby_id)
+                app.logger.info(
+                    "[Round] Round ended (success) for lobby %s", lobby_id)
 
     else:
         # Emit failure event
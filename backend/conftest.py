@@ -5,11 +5,18 @@ This file is automatically discovered by pytest.
 import pytest
 import sys
 import os
+import random
 
 # Add the backend directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 
+@pytest.fixture(scope="session", autouse=True)
+def seed_worker_random():
+    """Seed random per xdist worker so topic picks are reproducible"""
+    random.seed(os.environ.get('PYTEST_XDIST_WORKER', 'gw0'))
+
+
 @pytest.fixture(autouse=True)
 def reset_environment():
     """Reset environment variables for each test"""
@@ -16,8 +16,8 @@ def run_tests():
     if len(sys.argv) > 1:
         cmd.extend(sys.argv[1:])
     else:
-        # Default: verbose output with short traceback
-        cmd.extend(['-v', '--tb=short'])
+        # Default: verbose output with short traceback, one worker per core
+        cmd.extend(['-v', '--tb=short', '-n', 'auto'])
 
     print(f"Running: {' '.join(cmd)}")
     print("-" * 60)
@@ -5,9 +5,15 @@ Optimized for speed and token efficiency.
 import os
 import re
 import json
+import time
+import hashlib
 import random
 import logging
-from flask import Flask
+import tempfile
+import threading
+from pathlib import Path
+from collections import OrderedDict, deque
+from difflib import SequenceMatcher
 from functools import lru_cache
 from dotenv import load_dotenv
 
@@ -16,8 +22,6 @@ load_dotenv()
 
 # Configure logging - when imported, this will use the parent's logging config
 
-app = Flask(__name__)
-
 # API Keys
 GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY')
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
@@ -25,7 +29,9 @@ GOOGLE_CSE_ID = os.environ.get('GOOGLE_CSE_ID')
 
 # Optional Dependencies
 try:
-    from googleapiclient.discovery import build
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
     GOOGLE_SEARCH_AVAILABLE = True
 except ImportError:
     GOOGLE_SEARCH_AVAILABLE = False
@@ -39,10 +45,79 @@ except ImportError:
     GEMINI_AVAILABLE = False
     gemini_client = None
 
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 
 # Dynamically discover the best available Gemini model
 GEMINI_MODEL = None
 
+# Discovered model is persisted so startup can skip models.list()
+GEMINI_MODEL_CACHE_PATH = Path(os.environ.get(
+    'GEMINI_MODEL_CACHE', '~/.cache/skibidi/gemini_model.json')).expanduser()
+GEMINI_MODEL_CACHE_TTL = 7 * 24 * 60 * 60  # one week
+
+
+def _gemini_cache_key():
+    """Identify the API key and SDK version a cached model belongs to."""
+    sdk_version = getattr(genai, '__version__', '') if GEMINI_AVAILABLE else ''
+    # Google API keys share their leading characters, so hash the whole key
+    key_hash = hashlib.sha256((GEMINI_API_KEY or '').encode()).hexdigest()[:16]
+    return f"{key_hash}:{sdk_version}"
+
+
+def _load_cached_gemini_model():
+    """Return the cached model name if it is fresh and matches this key."""
+    try:
+        with open(GEMINI_MODEL_CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cached.get('key') != _gemini_cache_key():
+        return None
+    if time.time() - cached.get('ts', 0) > GEMINI_MODEL_CACHE_TTL:
+        return None
+    return cached.get('model')
+
+
+def _save_cached_gemini_model(model_name):
+    """Atomically persist the selected model name."""
+    tmp_path = None
+    try:
+        GEMINI_MODEL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=GEMINI_MODEL_CACHE_PATH.parent)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': _gemini_cache_key(),
+                       'model': model_name, 'ts': time.time()}, f)
+        os.replace(tmp_path, GEMINI_MODEL_CACHE_PATH)
+    except OSError as e:
+        logging.warning(f"[Gemini] Could not cache model selection: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _forget_gemini_model(model_name):
+    """Drop a model Gemini no longer serves so the next call rediscovers."""
+    global GEMINI_MODEL
+    if GEMINI_MODEL == model_name:
+        GEMINI_MODEL = None
+    try:
+        GEMINI_MODEL_CACHE_PATH.unlink()
+    except OSError:
+        pass
+    logging.warning("[Gemini] Model %s not found; will rediscover", model_name)
+
 
 def get_best_gemini_model():
     """Dynamically discover and return the best available Gemini model."""
@@ -55,6 +130,12 @@ def get_best_gemini_model():
         logging.warning("[Gemini] Gemini client not available")
         return None
 
+    cached_model = _load_cached_gemini_model()
+    if cached_model:
+        GEMINI_MODEL = cached_model
+        logging.info(f"[Gemini] Using cached model: {GEMINI_MODEL}")
+        return GEMINI_MODEL
+
     try:
         logging.info("[Gemini] Discovering available models...")
         models = gemini_client.models.list()
@@ -68,7 +149,7 @@ def get_best_gemini_model():
             # Check if model supports generateContent
             if 'generateContent' in model.supported_actions:
                 available_models.append(model_name)
-                logging.debug(f"[Gemini] Found model: {model_name}")
+                logging.debug("[Gemini] Found model: %s", model_name)
 
         # Select best model based on preference
         for keyword in preferred_keywords:
@@ -76,12 +157,14 @@ def get_best_gemini_model():
                 if keyword in model_name.lower():
                     GEMINI_MODEL = model_name
                     logging.info(f"[Gemini] Selected model: {GEMINI_MODEL}")
+                    _save_cached_gemini_model(GEMINI_MODEL)
                     return GEMINI_MODEL
 
         # If no preferred model, use the first available
         if available_models:
             GEMINI_MODEL = available_models[0]
             logging.info(f"[Gemini] Selected model: {GEMINI_MODEL}")
+            _save_cached_gemini_model(GEMINI_MODEL)
             return GEMINI_MODEL
 
         logging.warning("[Gemini] No suitable models found")
@@ -97,52 +180,217 @@ if GEMINI_AVAILABLE:
     get_best_gemini_model()
 
 
-@lru_cache(maxsize=50)
+# Custom Search is a single GET, so call the REST endpoint over one pooled
+# keep-alive session instead of going through googleapiclient
+CSE_ENDPOINT = 'https://customsearch.googleapis.com/customsearch/v1'
+CSE_TIMEOUT = 5  # seconds
+# Retry throttled and 5xx responses as well as connection failures
+CSE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _create_search_session():
+    """Build the shared HTTP session used for Custom Search requests."""
+    session = requests.Session()
+    retries = Retry(total=2, status_forcelist=CSE_RETRY_STATUSES,
+                    backoff_factor=0.5, allowed_methods=('GET',))
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4, pool_maxsize=32, max_retries=retries))
+    return session
+
+
+_search_session = _create_search_session() if GOOGLE_SEARCH_AVAILABLE else None
+
+
+# Cached search results are reused for this many seconds
+SEARCH_CACHE_TTL = 15 * 60
+
+
 def google_search(search_term, num_results=5):
     """Perform Google search with local caching for speed."""
-    logging.debug(f"[Search Debug] Starting search for: {search_term}")
-    logging.debug(
-        f"[Search Debug] Credentials check - Available: {GOOGLE_SEARCH_AVAILABLE}, Key: {bool(GOOGLE_API_KEY)}, CX: {bool(GOOGLE_CSE_ID)}")
+    ttl_bucket = int(time.time() // SEARCH_CACHE_TTL)
+    try:
+        return _cached_google_search(search_term, num_results, ttl_bucket)
+    except Exception as e:
+        logging.error(f"[Search Debug] Search error: {e}", exc_info=True)
+        return []
 
-    if GOOGLE_API_KEY:
-        logging.debug(
-            f"[Search Debug] API Key (first 10 chars): {GOOGLE_API_KEY[:10]}...")
-    if GOOGLE_CSE_ID:
+
+@lru_cache(maxsize=256)
+def _cached_google_search(search_term, num_results, ttl_bucket):
+    """
+    Uncached search body; ttl_bucket only rotates the cache key.
+    Errors propagate so that lru_cache never stores a failed search.
+    """
+    logging.debug("[Search Debug] Starting search for: %s", search_term)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
         logging.debug(
-            f"[Search Debug] CSE ID (first 10 chars): {GOOGLE_CSE_ID[:10]}...")
+            "[Search Debug] Credentials check - Available: %s, Key: %s, CX: %s",
+            GOOGLE_SEARCH_AVAILABLE, bool(GOOGLE_API_KEY), bool(GOOGLE_CSE_ID))
+
+        if GOOGLE_API_KEY:
+            logging.debug(
+                "[Search Debug] API Key (first 10 chars): %s...", GOOGLE_API_KEY[:10])
+        if GOOGLE_CSE_ID:
+            logging.debug(
+                "[Search Debug] CSE ID (first 10 chars): %s...", GOOGLE_CSE_ID[:10])
 
     if not (GOOGLE_SEARCH_AVAILABLE and GOOGLE_API_KEY and GOOGLE_CSE_ID):
         logging.warning(
             "[Search Debug] Search unavailable due to missing credentials or library")
         return []
 
+    response = _search_session.get(CSE_ENDPOINT, params={
+        'q': search_term,
+        'cx': GOOGLE_CSE_ID,
+        'num': num_results,
+        'key': GOOGLE_API_KEY
+    }, timeout=CSE_TIMEOUT)
+    response.raise_for_status()
+    result = json_loads(response.content)
+
+    logging.debug("[Search Debug] API Result keys: %s", result.keys())
+    items = result.get('items', [])
+    logging.debug("[Search Debug] Items found: %s", len(items))
+
+    search_results = [{
+        'title': item.get('title', ''),
+        'snippet': item.get('snippet', ''),
+        'link': item.get('link', ''),
+        'displayLink': item.get('displayLink', '')
+    } for item in items]
+    return search_results
+
+
+# Stay under the Gemini per-minute quota (free tier allows 60 RPM); bursts
+# wait up to GEMINI_MAX_WAIT seconds for a slot before callers fall back
+GEMINI_MAX_RPM = int(os.environ.get('GEMINI_MAX_RPM', 55))
+GEMINI_MAX_WAIT = 5  # seconds
+GEMINI_MAX_BACKOFF = 60  # seconds
+_gemini_call_times = deque()
+_gemini_backoff = {'until': 0.0, 'delay': 0.0}
+_gemini_rate_lock = threading.Lock()
+
+
+def _acquire_gemini_slot():
+    """Reserve a slot in the sliding one-minute window; False if none soon."""
+    deadline = time.time() + GEMINI_MAX_WAIT
+    while True:
+        with _gemini_rate_lock:
+            now = time.time()
+            if now < _gemini_backoff['until']:
+                return False
+            while _gemini_call_times and now - _gemini_call_times[0] >= 60:
+                _gemini_call_times.popleft()
+            if len(_gemini_call_times) < GEMINI_MAX_RPM:
+                _gemini_call_times.append(now)
+                return True
+            wait = 60 - (now - _gemini_call_times[0])
+        if now + wait > deadline:
+            return False
+        time.sleep(wait)
+
+
+def _record_gemini_rate_limited():
+    """Back off exponentially after a 429 from Gemini."""
+    with _gemini_rate_lock:
+        delay = min(GEMINI_MAX_BACKOFF, max(1.0, _gemini_backoff['delay'] * 2))
+        _gemini_backoff['delay'] = delay
+        _gemini_backoff['until'] = time.time() + delay
+    logging.warning(f"[Gemini] Rate limited, backing off for {delay:.0f}s")
+
+
+def _generate_gemini_json(model_name, prompt, schema):
+    """Rate-limited structured Gemini call; returns the raw JSON text."""
+    if not _acquire_gemini_slot():
+        raise RuntimeError("Gemini request budget exhausted")
+
     try:
-        service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY)
-        logging.debug("[Search Debug] Service built, executing query...")
-        # Pass key parameter explicitly to ensure API authentication
-        result = service.cse().list(
-            q=search_term,
-            cx=GOOGLE_CSE_ID,
-            num=num_results,
-            key=GOOGLE_API_KEY
-        ).execute()
-
-        logging.debug(f"[Search Debug] API Result keys: {result.keys()}")
-        items = result.get('items', [])
-        logging.debug(f"[Search Debug] Items found: {len(items)}")
-
-        search_results = []
-        for item in items:
-            search_results.append({
-                'title': item.get('title', ''),
-                'snippet': item.get('snippet', ''),
-                'link': item.get('link', ''),
-                'displayLink': item.get('displayLink', '')
-            })
-        return search_results
+        response = gemini_client.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config={'response_mime_type': 'application/json',
+                    'response_schema': schema}
+        )
     except Exception as e:
-        logging.error(f"[Search Debug] Search error: {e}", exc_info=True)
-        return []
+        code = getattr(e, 'code', None)
+        if code == 429:
+            _record_gemini_rate_limited()
+        elif code == 404:
+            # A cached model can be retired before the cache TTL runs out
+            _forget_gemini_model(model_name)
+        raise
+
+    with _gemini_rate_lock:
+        _gemini_backoff['delay'] = 0.0
+
+    # Some versions of the SDK return response.text, others response.candidates[0].content.parts[0].text
+    # Adding a small check for robustness
+    return response.text if hasattr(
+        response, 'text') else response.candidates[0].content.parts[0].text
+
+
+# Structured output schemas so Gemini returns directly parseable JSON
+REDACTION_RESPONSE_SCHEMA = {
+    'type': 'ARRAY',
+    'items': {
+        'type': 'OBJECT',
+        'properties': {
+            'id': {'type': 'INTEGER'},
+            't': {'type': 'STRING'},
+            's': {'type': 'STRING'}
+        },
+        'required': ['id', 't', 's']
+    }
+}
+
+VERIFICATION_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'is_correct': {'type': 'BOOLEAN'},
+        'similarity_score': {'type': 'NUMBER'},
+        'reason': {'type': 'STRING'}
+    },
+    'required': ['is_correct', 'similarity_score', 'reason']
+}
+
+
+# Refined redactions are reused across players searching the same thing
+REDACTION_CACHE_TTL = 10 * 60
+REDACTION_CACHE_SIZE = 256
+_redaction_cache = OrderedDict()  # key -> (expires_at, results)
+_redaction_inflight = {}  # key -> Event set when the owning call finishes
+_redaction_lock = threading.Lock()
+
+
+def _redaction_cache_key(search_results, forbidden_words, search_query, secret_topic):
+    """Hash the normalized redaction inputs into a compact cache key."""
+    payload = json_dumps([search_query, secret_topic,
+                         sorted(forbidden_words), search_results])
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def _get_cached_redaction(key):
+    """Return a copy of a fresh cached redaction, or None."""
+    with _redaction_lock:
+        entry = _redaction_cache.get(key)
+        if not entry:
+            return None
+        expires_at, results = entry
+        if expires_at < time.time():
+            del _redaction_cache[key]
+            return None
+        _redaction_cache.move_to_end(key)
+    return [dict(r) for r in results]
+
+
+def _cache_redaction(key, results):
+    """Store a copy of refined results, evicting the oldest entries."""
+    with _redaction_lock:
+        _redaction_cache[key] = (time.time() + REDACTION_CACHE_TTL,
+                                 [dict(r) for r in results])
+        _redaction_cache.move_to_end(key)
+        while len(_redaction_cache) > REDACTION_CACHE_SIZE:
+            _redaction_cache.popitem(last=False)
 
 
 def redact_with_gemini(search_results, forbidden_words, search_query, secret_topic):
@@ -150,9 +398,39 @@ def redact_with_gemini(search_results, forbidden_words, search_query, secret_top
     local_redacted = simple_redaction(
         search_results, forbidden_words, search_query)
 
-    if not GEMINI_AVAILABLE:
+    # Nothing to refine: skip the Gemini round-trip entirely
+    if not GEMINI_AVAILABLE or not local_redacted:
         return local_redacted
 
+    cache_key = _redaction_cache_key(
+        search_results, forbidden_words, search_query, secret_topic)
+    cached = _get_cached_redaction(cache_key)
+    if cached is not None:
+        return cached
+
+    # Let only one caller per key hit Gemini; the rest wait for its result
+    with _redaction_lock:
+        inflight = _redaction_inflight.get(cache_key)
+        if inflight is None:
+            _redaction_inflight[cache_key] = threading.Event()
+    if inflight is not None:
+        inflight.wait(timeout=30)
+        cached = _get_cached_redaction(cache_key)
+        return cached if cached is not None else local_redacted
+
+    try:
+        refined = _refine_with_gemini(local_redacted, secret_topic)
+        if refined is None:
+            return local_redacted
+        _cache_redaction(cache_key, refined)
+        return refined
+    finally:
+        with _redaction_lock:
+            _redaction_inflight.pop(cache_key).set()
+
+
+def _refine_with_gemini(local_redacted, secret_topic):
+    """Ask Gemini to refine locally redacted results; None on failure."""
     text_to_refine = []
     for i, res in enumerate(local_redacted):
         text_to_refine.append(
@@ -162,7 +440,7 @@ def redact_with_gemini(search_results, forbidden_words, search_query, secret_top
     prompt = f"""
     Refine redaction for: {secret_topic}. 
     Redact remaining synonyms or giveaways with [REDACTED].
-    DATA: {json.dumps(text_to_refine)}
+    DATA: {json_dumps(text_to_refine)}
     Return ONLY JSON: [{{ "id": 0, "t": "...", "s": "..." }}]
     """
 
@@ -171,21 +449,12 @@ def redact_with_gemini(search_results, forbidden_words, search_query, secret_top
     if not model_name:
         logging.warning(
             "[Gemini] No model available, falling back to simple redaction")
-        return local_redacted
+        return None
 
     try:
-        response = gemini_client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config={'response_mime_type': 'application/json'}
-        )
-
-        # Some versions of the SDK return response.text, others response.candidates[0].content.parts[0].text
-        # Adding a small check for robustness
-        content_text = response.text if hasattr(
-            response, 'text') else response.candidates[0].content.parts[0].text
-
-        refined_data = json.loads(content_text)
+        content_text = _generate_gemini_json(
+            model_name, prompt, REDACTION_RESPONSE_SCHEMA)
+        refined_data = json_loads(content_text)
         for item in refined_data:
             idx = item['id']
             if 0 <= idx < len(local_redacted):
@@ -193,8 +462,8 @@ def redact_with_gemini(search_results, forbidden_words, search_query, secret_top
                 local_redacted[idx]['snippet'] = item['s']
         return local_redacted
     except Exception as e:
-        app.logger.error(f"Gemini error: {e}")
-        return local_redacted
+        logging.error(f"[Gemini] Redaction error: {e}")
+        return None
 
 
 def simple_redaction(search_results, forbidden_words, search_query):
@@ -205,60 +474,151 @@ def simple_redaction(search_results, forbidden_words, search_query):
 
     redacted_results = []
     for result in search_results:
-        res = result.copy()
-        res['title'] = pattern.sub('[REDACTED]', res.get('title', ''))
-        res['snippet'] = pattern.sub('[REDACTED]', res.get('snippet', ''))
-        redacted_results.append(res)
+        redacted_results.append({
+            'title': _redact_field(pattern, result.get('title', '')),
+            'snippet': _redact_field(pattern, result.get('snippet', '')),
+            'link': result.get('link', ''),
+            'displayLink': result.get('displayLink', '')
+        })
     return redacted_results
 
 
+def _redact_field(pattern, text):
+    """Replace every match in one result field with [REDACTED]."""
+    if text.isascii():
+        pattern = _get_ascii_variant(pattern)
+    return pattern.sub('[REDACTED]', text)
+
+
 def identify_redacted_terms(search_results, forbidden_words, search_query, secret_topic):
     """
     REQUIRED BY WEBSOCKET SERVER.
     Identifies positions of terms to be redacted for UI highlighting.
     """
     # Include secret topic in the words to find
-    all_forbidden = list(forbidden_words) + [secret_topic]
-    pattern = _get_redaction_pattern(tuple(all_forbidden), search_query)
+    words = _get_redaction_words(
+        tuple(forbidden_words), search_query, secret_topic)
+    pattern = _compile_redaction_pattern(words)
+    lower_pattern = _get_lowercase_variant(pattern) if pattern else None
 
     results_with_indicators = []
     for result in search_results:
-        res_copy = result.copy()
-        res_copy['redactedTerms'] = {'title': [], 'snippet': []}
+        title = result.get('title', '')
+        snippet = result.get('snippet', '')
+        if pattern:
+            redacted_terms = {
+                'title': _find_redacted_terms(
+                    title, words, pattern, lower_pattern),
+                'snippet': _find_redacted_terms(
+                    snippet, words, pattern, lower_pattern)
+            }
+        else:
+            redacted_terms = {'title': [], 'snippet': []}
+
+        results_with_indicators.append({
+            'title': title,
+            'snippet': snippet,
+            'link': result.get('link', ''),
+            'displayLink': result.get('displayLink', ''),
+            'redactedTerms': redacted_terms
+        })
 
-        if not pattern:
-            results_with_indicators.append(res_copy)
-            continue
+    return results_with_indicators
 
-        for field in ['title', 'snippet']:
-            text = result.get(field, '')
-            res_copy['redactedTerms'][field] = [
-                {'start': m.start(), 'end': m.end(), 'word': m.group()}
-                for m in pattern.finditer(text)
-            ]
-        results_with_indicators.append(res_copy)
 
-    return results_with_indicators
+@lru_cache(maxsize=128)
+def _get_ascii_variant(pattern):
+    """
+    re.ASCII copy of pattern for scanning ASCII text, or pattern itself if
+    its words are not ASCII. re.ASCII also changes which characters \\b
+    treats as word characters, so only use it on ASCII text.
+    """
+    if not pattern.pattern.isascii():
+        return pattern
+    return re.compile(pattern.pattern, (pattern.flags & ~re.UNICODE) | re.ASCII)
+
+
+@lru_cache(maxsize=128)
+def _get_lowercase_variant(pattern):
+    """ASCII pattern without IGNORECASE, for matching pre-lowercased ASCII text."""
+    ascii_pattern = _get_ascii_variant(pattern)
+    return re.compile(ascii_pattern.pattern, ascii_pattern.flags & ~re.IGNORECASE)
+
+
+def _find_redacted_terms(text, words, pattern, lower_pattern):
+    """Return the span and original spelling of every match in text."""
+    if text.isascii():
+        text_lower = text.lower()
+        # Plain substring checks rule out most fields before the regex runs
+        if not any(w in text_lower for w in words):
+            return []
+        # Lowercasing ASCII keeps offsets aligned, so scan without case folding
+        return [
+            {'start': m.start(), 'end': m.end(), 'word': text[m.start():m.end()]}
+            for m in lower_pattern.finditer(text_lower)
+        ]
+    return [
+        {'start': m.start(), 'end': m.end(), 'word': m.group()}
+        for m in pattern.finditer(text)
+    ]
 
 
 @lru_cache(maxsize=128)
-def _get_redaction_pattern(forbidden_tuple, search_query):
+def _get_redaction_words(forbidden_tuple, search_query, secret_topic=''):
+    """Lowercased words to redact, longest first so phrases beat prefixes."""
+    words = {w.lower() for w in forbidden_tuple if len(w) > 2}
+    words.update(w for w in search_query.lower().split() if len(w) > 2)
+    if len(secret_topic) > 2:
+        words.add(secret_topic.lower())
+    # Sorted so the pattern is identical regardless of set ordering
+    return tuple(sorted(words, key=lambda w: (-len(w), w)))
+
+
+def _get_redaction_pattern(forbidden_tuple, search_query, secret_topic=''):
     """Helper to compile and cache regex patterns."""
-    words = set(forbidden_tuple)
-    words.update(search_query.lower().split())
-    clean_words = [re.escape(w) for w in words if len(w) > 2]
-    if not clean_words:
+    return _compile_redaction_pattern(
+        _get_redaction_words(forbidden_tuple, search_query, secret_topic))
+
+
+@lru_cache(maxsize=128)
+def _compile_redaction_pattern(words):
+    """Compile one whole-word alternation; equal word lists share it."""
+    if not words:
         return None
-    return re.compile(r'\b(' + '|'.join(clean_words) + r')\b', re.IGNORECASE)
+    alternation = '|'.join(re.escape(w) for w in words)
+    return re.compile(r'\b(' + alternation + r')\b', re.IGNORECASE)
+
+
+_WORD_RE = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=512)
+def _split_forbidden_words(forbidden_tuple):
+    """
+    Split forbidden words into a casefolded frozenset of single tokens and
+    a tuple of (phrase, whole-word regex) pairs for the remaining entries.
+    Phrases get one regex each so overlapping phrases are all reported.
+    """
+    tokens = frozenset(w.casefold() for w in forbidden_tuple
+                       if _WORD_RE.fullmatch(w))
+    phrases = {w.casefold() for w in forbidden_tuple
+               if w and not _WORD_RE.fullmatch(w)}
+    phrase_patterns = tuple(
+        (phrase, re.compile(r'\b' + re.escape(phrase) + r'\b'))
+        for phrase in sorted(phrases))
+    return tokens, phrase_patterns
 
 
 def validate_query_logic(query, forbidden_words):
     """Validate query against forbidden list."""
     if not query:
         return {'valid': True, 'violations': []}
-    query_lower = query.lower()
-    violations = [w for w in forbidden_words if re.search(
-        r'\b' + re.escape(w.lower()) + r'\b', query_lower)]
+    tokens, phrase_patterns = _split_forbidden_words(tuple(forbidden_words))
+    query_folded = query.casefold()
+    found = {t for t in _WORD_RE.findall(query_folded) if t in tokens}
+    found.update(phrase for phrase, pattern in phrase_patterns
+                 if pattern.search(query_folded))
+    violations = [w for w in forbidden_words if w.casefold() in found]
     return {
         'valid': len(violations) == 0,
         'violations': violations,
@@ -266,6 +626,69 @@ def validate_query_logic(query, forbidden_words):
     }
 
 
+# Guesses are only sent to Gemini when their spelling similarity to the topic
+# falls between these two ratios; anything outside is decided locally.
+LOCAL_REJECT_RATIO = 0.4
+LOCAL_ACCEPT_RATIO = 0.85
+
+
+_LEADING_ARTICLES = ('the ', 'a ', 'an ')
+
+
+@lru_cache(maxsize=256)
+def _topic_variants(topic):
+    """Lowercased topic plus the set of exact-match forms (article dropped)."""
+    t = topic.strip().lower()
+    variants = {t}
+    for article in _LEADING_ARTICLES:
+        if t.startswith(article):
+            variants.add(t[len(article):].lstrip())
+    return t, frozenset(variants)
+
+
+def _local_guess_check(guess, topic):
+    """
+    Decide obvious hits and misses without an LLM call, else None.
+    Misses rejected on a quick bound report that upper bound, not the exact
+    ratio, as similarity_score; callers only score correct guesses.
+    """
+    t, variants = _topic_variants(topic)
+    g = guess.strip().lower()
+    if g in variants or t in g:
+        return {
+            "is_correct": True,
+            "similarity_score": 1.0,
+            "reason": "Exact match"
+        }
+
+    matcher = SequenceMatcher(None, g, t)
+    # real_quick_ratio() >= quick_ratio() >= ratio(); try the cheapest bound
+    # first so clear misses skip the full longest-match search
+    for upper_bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+        bound = upper_bound()
+        if bound < LOCAL_REJECT_RATIO:
+            return {
+                "is_correct": False,
+                "similarity_score": bound,
+                "reason": "No close match"
+            }
+
+    ratio = matcher.ratio()
+    if ratio > LOCAL_ACCEPT_RATIO:
+        return {
+            "is_correct": True,
+            "similarity_score": ratio,
+            "reason": "Close spelling match"
+        }
+    if ratio < LOCAL_REJECT_RATIO:
+        return {
+            "is_correct": False,
+            "similarity_score": ratio,
+            "reason": "No close match"
+        }
+    return None
+
+
 def verify_guess_with_gemini(guess, topic):
     """
     Verify if a guess matches the secret topic using Gemini for semantic similarity.
@@ -280,6 +703,10 @@ def verify_guess_with_gemini(guess, topic):
             "reason": "Exact match (Gemini unavailable)"
         }
 
+    local_result = _local_guess_check(guess, topic)
+    if local_result:
+        return local_result
+
     prompt = f"""
     Compare the guess "{guess}" with the secret topic "{topic}".
     Is the guess semantically close enough to count as a correct answer?
@@ -301,19 +728,12 @@ def verify_guess_with_gemini(guess, topic):
         }
 
     try:
-        response = gemini_client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config={'response_mime_type': 'application/json'}
-        )
-
-        content_text = response.text if hasattr(
-            response, 'text') else response.candidates[0].content.parts[0].text
-
-        result = json.loads(content_text)
+        content_text = _generate_gemini_json(
+            model_name, prompt, VERIFICATION_RESPONSE_SCHEMA)
+        result = json_loads(content_text)
         return result
     except Exception as e:
-        app.logger.error(f"Gemini verification error: {e}")
+        logging.error(f"[Gemini] Verification error: {e}")
         # Fallback
         is_correct = guess.lower() == topic.lower() or topic.lower() in guess.lower()
         return {
@@ -323,16 +743,22 @@ def verify_guess_with_gemini(guess, topic):
         }
 
 
+# Static list of topics for the game, built once at import
+TOPICS = (
+    {'topic': 'Moon Landing', 'forbidden_words': [
+        'moon', 'apollo', 'armstrong', 'nasa', 'space', 'lunar']},
+    {'topic': 'Pizza', 'forbidden_words': [
+        'pizza', 'cheese', 'pepperoni', 'italian', 'dough']},
+    {'topic': 'Bitcoin', 'forbidden_words': [
+        'bitcoin', 'crypto', 'blockchain', 'satoshi', 'mining']},
+    {'topic': 'The Eiffel Tower', 'forbidden_words': [
+        'eiffel', 'tower', 'paris', 'france', 'iron']}
+)
+
+
 def get_random_topic_data():
-    """Static list of topics for the game."""
-    topics = [
-        {'topic': 'Moon Landing', 'forbidden_words': [
-            'moon', 'apollo', 'armstrong', 'nasa', 'space', 'lunar']},
-        {'topic': 'Pizza', 'forbidden_words': [
-            'pizza', 'cheese', 'pepperoni', 'italian', 'dough']},
-        {'topic': 'Bitcoin', 'forbidden_words': [
-            'bitcoin', 'crypto', 'blockchain', 'satoshi', 'mining']},
-        {'topic': 'The Eiffel Tower', 'forbidden_words': [
-            'eiffel', 'tower', 'paris', 'france', 'iron']}
-    ]
-    return random.choice(topics)
+    """
+    Pick a random topic from the static list.
+    The returned dict is shared; copy it before mutating.
+    """
+    return TOPICS[random.randrange(len(TOPICS))]
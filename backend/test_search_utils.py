@@ -2,50 +2,76 @@
 Test cases for search_utils.py
 Tests search, redaction, validation, and topic generation functions
 """
+import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock
+import search_utils
 from search_utils import (
     google_search,
     redact_with_gemini,
     simple_redaction,
+    identify_redacted_terms,
     validate_query_logic,
+    verify_guess_with_gemini,
     get_random_topic_data
 )
 
 
+def _result(title, snippet, link='https://example.com', display='example.com'):
+    """Build one search result dict"""
+    return {
+        'title': title,
+        'snippet': snippet,
+        'link': link,
+        'displayLink': display
+    }
+
+
+def _cse_body(items=None):
+    """Encode a Custom Search response body; no items key when empty"""
+    return json.dumps({'items': items} if items else {}).encode()
+
+
+# Structured-output reply for one 'Bitcoin guide' result, as Gemini returns it
+_GEMINI_REDACTION_RESPONSE = (
+    '[{"id": 0, "t": "[REDACTED] guide", "s": "Learn about [REDACTED]"}]')
+
+
+def _gemini_stub(text):
+    """Plain stand-in for the Gemini client when no call assertions are needed"""
+    response = SimpleNamespace(text=text)
+    return SimpleNamespace(models=SimpleNamespace(
+        generate_content=lambda *args, **kwargs: response))
+
+
 class TestGoogleSearch:
     """Test cases for Google Search functionality"""
 
-    @patch('search_utils.GOOGLE_SEARCH_AVAILABLE', True)
-    @patch('search_utils.GOOGLE_API_KEY', 'test_api_key')
-    @patch('search_utils.build')
-    def test_google_search_success(self, mock_build):
+    @pytest.fixture(autouse=True)
+    def reset_search_cache(self):
+        """Drop cached results between tests"""
+        search_utils._cached_google_search.cache_clear()
+        yield
+        search_utils._cached_google_search.cache_clear()
+
+    @pytest.fixture
+    def search_session(self, monkeypatch):
+        """Configure credentials and swap in a mock HTTP session"""
+        session = Mock()
+        monkeypatch.setattr('search_utils.GOOGLE_SEARCH_AVAILABLE', True)
+        monkeypatch.setattr('search_utils.GOOGLE_API_KEY', 'test_api_key')
+        monkeypatch.setattr('search_utils.GOOGLE_CSE_ID', 'test_cse_id')
+        monkeypatch.setattr('search_utils._search_session', session)
+        return session
+
+    def test_google_search_success(self, search_session):
         """Test successful Google search"""
         # Mock the API response
-        mock_service = Mock()
-        mock_cse = Mock()
-        mock_list = Mock()
-
-        mock_list.execute.return_value = {
-            'items': [
-                {
-                    'title': 'Test Title 1',
-                    'snippet': 'Test snippet 1',
-                    'link': 'https://example.com/1',
-                    'displayLink': 'example.com'
-                },
-                {
-                    'title': 'Test Title 2',
-                    'snippet': 'Test snippet 2',
-                    'link': 'https://example.com/2',
-                    'displayLink': 'example.com'
-                }
-            ]
-        }
-
-        mock_cse.list.return_value = mock_list
-        mock_service.cse.return_value = mock_cse
-        mock_build.return_value = mock_service
+        search_session.get.return_value.content = _cse_body([
+            _result('Test Title 1', 'Test snippet 1', 'https://example.com/1'),
+            _result('Test Title 2', 'Test snippet 2', 'https://example.com/2'),
+        ])
 
         results = google_search('test query', num_results=2)
 
@@ -55,125 +81,234 @@ class TestGoogleSearch:
         assert results[0]['link'] == 'https://example.com/1'
         assert results[1]['title'] == 'Test Title 2'
 
-    @patch('search_utils.GOOGLE_SEARCH_AVAILABLE', False)
-    def test_google_search_unavailable(self):
+    def test_google_search_request_params(self, search_session):
+        """Test that the CSE endpoint is called with the query parameters"""
+        search_session.get.return_value.content = _cse_body()
+
+        results = google_search('test query', num_results=3)
+
+        assert results == []
+        args, kwargs = search_session.get.call_args
+        assert args[0] == search_utils.CSE_ENDPOINT
+        assert kwargs['params'] == {
+            'q': 'test query',
+            'cx': 'test_cse_id',
+            'num': 3,
+            'key': 'test_api_key'
+        }
+
+    def test_google_search_unavailable(self, monkeypatch):
         """Test Google search when service is unavailable"""
+        monkeypatch.setattr('search_utils.GOOGLE_SEARCH_AVAILABLE', False)
         results = google_search('test query')
         assert results == []
 
-    @patch('search_utils.GOOGLE_SEARCH_AVAILABLE', True)
-    @patch('search_utils.GOOGLE_API_KEY', None)
-    def test_google_search_no_api_key(self):
+    def test_google_search_no_api_key(self, monkeypatch):
         """Test Google search without API key"""
+        monkeypatch.setattr('search_utils.GOOGLE_SEARCH_AVAILABLE', True)
+        monkeypatch.setattr('search_utils.GOOGLE_API_KEY', None)
         results = google_search('test query')
         assert results == []
 
-    @patch('search_utils.GOOGLE_SEARCH_AVAILABLE', True)
-    @patch('search_utils.GOOGLE_API_KEY', 'test_api_key')
-    @patch('search_utils.build')
-    def test_google_search_api_error(self, mock_build):
+    def test_google_search_api_error(self, search_session):
         """Test Google search API error handling"""
-        mock_build.side_effect = Exception('API Error')
+        search_session.get.side_effect = Exception('API Error')
 
         results = google_search('test query')
         assert results == []
 
+    def test_google_search_error_not_cached(self, search_session):
+        """Test that a failed search is retried instead of served from cache"""
+        search_session.get.side_effect = [
+            Exception('API Error'), search_session.get.return_value]
+        search_session.get.return_value.content = _cse_body([
+            _result('Test Title 1', 'Test snippet 1', 'https://example.com/1')])
+
+        assert google_search('test query') == []
+        assert len(google_search('test query')) == 1
+
+    def test_search_session_retries_error_statuses(self):
+        """Test that throttled and 5xx responses are retried, not just connects"""
+        retries = search_utils._create_search_session().get_adapter(
+            search_utils.CSE_ENDPOINT).max_retries
+
+        assert retries.total == 2
+        assert set(retries.status_forcelist) == {429, 500, 502, 503, 504}
+
+
+class TestGeminiModelCache:
+    """Test cases for the on-disk Gemini model selection cache"""
+
+    @pytest.fixture(autouse=True)
+    def cache_path(self, tmp_path, monkeypatch):
+        """Point the model cache at a per-test file"""
+        path = tmp_path / 'model.json'
+        monkeypatch.setattr('search_utils.GEMINI_MODEL_CACHE_PATH', path)
+        return path
+
+    def test_cache_round_trip(self):
+        """Test that a saved model is loaded back for the same key"""
+        search_utils._save_cached_gemini_model('gemini-flash')
+        assert search_utils._load_cached_gemini_model() == 'gemini-flash'
+
+    def test_cache_ignores_other_key(self, monkeypatch):
+        """Test that a cache written for another API key is ignored"""
+        # Real keys share a common prefix, so only the tails differ here
+        monkeypatch.setattr('search_utils.GEMINI_API_KEY', 'AIzaSyKeyOne')
+        search_utils._save_cached_gemini_model('gemini-flash')
+        monkeypatch.setattr('search_utils.GEMINI_API_KEY', 'AIzaSyKeyTwo')
+        assert search_utils._load_cached_gemini_model() is None
+
+    def test_cache_expired(self, monkeypatch):
+        """Test that a stale cache entry is ignored"""
+        search_utils._save_cached_gemini_model('gemini-flash')
+        monkeypatch.setattr('search_utils.GEMINI_MODEL_CACHE_TTL', -1)
+        assert search_utils._load_cached_gemini_model() is None
+
+    def test_cache_missing_file(self, cache_path):
+        """Test that a missing cache file is treated as a miss"""
+        assert not cache_path.exists()
+        assert search_utils._load_cached_gemini_model() is None
+
+    def test_failed_save_removes_temp_file(self, cache_path, monkeypatch):
+        """Test that a failed rename does not leave the temp file behind"""
+        monkeypatch.setattr('search_utils.os.replace',
+                            Mock(side_effect=OSError('read-only')))
+
+        search_utils._save_cached_gemini_model('gemini-flash')
+
+        assert list(cache_path.parent.iterdir()) == []
+
+    def test_model_not_found_clears_cache(self, cache_path, monkeypatch):
+        """Test that a retired cached model is forgotten so it is rediscovered"""
+        search_utils._save_cached_gemini_model('gemini-old')
+        monkeypatch.setattr('search_utils.GEMINI_MODEL', 'gemini-old')
+        error = Exception('model not found')
+        error.code = 404
+        client = Mock()
+        client.models.generate_content.side_effect = error
+        monkeypatch.setattr('search_utils.gemini_client', client)
+
+        with pytest.raises(Exception):
+            search_utils._generate_gemini_json('gemini-old', 'prompt', {})
+
+        assert search_utils.GEMINI_MODEL is None
+        assert not cache_path.exists()
+
 
 class TestSimpleRedaction:
     """Test cases for simple redaction fallback"""
 
-    def test_simple_redaction_basic(self):
-        """Test basic redaction functionality"""
-        search_results = [
-            {
-                'title': 'Bitcoin cryptocurrency explained',
-                'snippet': 'Bitcoin is a digital currency that uses blockchain technology',
-                'link': 'https://example.com',
-                'displayLink': 'example.com'
-            }
-        ]
-
-        forbidden_words = ['bitcoin', 'cryptocurrency']
-        search_query = 'digital currency'
-
+    @pytest.mark.parametrize('title, snippet, forbidden_words, search_query, expected_title, expected_snippet', [
+        # Forbidden words and query tokens; non-forbidden words preserved
+        ('Bitcoin cryptocurrency explained',
+         'Bitcoin is a digital currency that uses blockchain technology',
+         ['bitcoin', 'cryptocurrency'], 'digital currency',
+         '[REDACTED] [REDACTED] explained',
+         '[REDACTED] is a [REDACTED] [REDACTED] that uses blockchain technology'),
+        # Case-insensitive
+        ('BITCOIN and Bitcoin', 'bitcoin cryptocurrency', ['bitcoin'], '',
+         '[REDACTED] and [REDACTED]', '[REDACTED] cryptocurrency'),
+        # Short words (<=2 chars) are not redacted
+        ('Go programming language', 'Go is a great language', ['go', 'is'], '',
+         'Go programming language', 'Go is a great language'),
+        # A phrase is redacted whole, not split on a shorter word
+        ('The moon landing of 1969', 'A small step on the moon',
+         ['moon', 'moon landing'], '',
+         'The [REDACTED] of 1969', 'A small step on the [REDACTED]'),
+        ('Digital gold: Bitcoin and Blockchain',
+         'Mining digital coins on the blockchain',
+         ['bitcoin', 'blockchain', 'Bitcoin'], 'Digital mining',
+         '[REDACTED] gold: [REDACTED] and [REDACTED]',
+         '[REDACTED] [REDACTED] coins on the [REDACTED]'),
+        # Accented letters are word characters, so no mid-word redaction
+        ('Le résumé de Café naïve', 'caf et sum',
+         ['sum', 'caf'], '',
+         'Le résumé de Café naïve', '[REDACTED] et [REDACTED]'),
+    ], ids=['basic', 'case-insensitive', 'short-words', 'longest-phrase',
+            'forbidden-and-query', 'non-ascii-text'])
+    def test_simple_redaction(self, title, snippet, forbidden_words,
+                              search_query, expected_title, expected_snippet):
+        """Test redaction of titles and snippets"""
         redacted = simple_redaction(
-            search_results, forbidden_words, search_query)
+            [_result(title, snippet)], forbidden_words, search_query)
 
         assert len(redacted) == 1
-        assert '[REDACTED]' in redacted[0]['title']
-        assert '[REDACTED]' in redacted[0]['snippet']
-        # Non-forbidden word preserved
-        assert 'explained' in redacted[0]['title']
+        assert redacted[0]['title'] == expected_title
+        assert redacted[0]['snippet'] == expected_snippet
 
-    def test_simple_redaction_case_insensitive(self):
-        """Test case-insensitive redaction"""
+    def test_simple_redaction_preserves_link(self):
+        """Test that redaction preserves links"""
         search_results = [
-            {
-                'title': 'BITCOIN and Bitcoin',
-                'snippet': 'bitcoin cryptocurrency',
-                'link': 'https://example.com',
-                'displayLink': 'example.com'
-            }
+            _result('Bitcoin guide', 'Learn about bitcoin',
+                    link='https://bitcoin.com', display='bitcoin.com')
         ]
 
-        forbidden_words = ['bitcoin']
-        search_query = ''
+        redacted = simple_redaction(search_results, ['bitcoin'], '')
 
-        redacted = simple_redaction(
-            search_results, forbidden_words, search_query)
+        assert redacted[0]['link'] == 'https://bitcoin.com'
+        assert redacted[0]['displayLink'] == 'bitcoin.com'
 
-        # All variations should be redacted
-        assert redacted[0]['title'].count('[REDACTED]') == 2
-        assert redacted[0]['snippet'].count('[REDACTED]') == 1
 
-    def test_simple_redaction_preserves_link(self):
-        """Test that redaction preserves links"""
-        search_results = [
-            {
-                'title': 'Bitcoin guide',
-                'snippet': 'Learn about bitcoin',
-                'link': 'https://bitcoin.com',
-                'displayLink': 'bitcoin.com'
-            }
-        ]
+class TestIdentifyRedactedTerms:
+    """Test cases for redaction position indicators"""
 
-        forbidden_words = ['bitcoin']
-        search_query = ''
+    def test_identify_includes_secret_topic(self):
+        """Test that the secret topic is flagged even if not forbidden"""
+        search_results = [{
+            'title': 'Pizza night',
+            'snippet': 'Fresh dough every day',
+            'link': 'https://example.com',
+            'displayLink': 'example.com'
+        }]
 
-        redacted = simple_redaction(
-            search_results, forbidden_words, search_query)
+        results = identify_redacted_terms(
+            search_results, ['dough'], '', 'Pizza')
 
-        assert redacted[0]['link'] == 'https://bitcoin.com'
-        assert redacted[0]['displayLink'] == 'bitcoin.com'
+        assert results[0]['redactedTerms']['title'] == [
+            {'start': 0, 'end': 5, 'word': 'Pizza'}]
+        assert results[0]['redactedTerms']['snippet'] == [
+            {'start': 6, 'end': 11, 'word': 'dough'}]
+        assert results[0]['title'] == 'Pizza night'
 
-    def test_simple_redaction_short_words(self):
-        """Test that short words (<=2 chars) are not redacted"""
-        search_results = [
-            {
-                'title': 'Go programming language',
-                'snippet': 'Go is a great language',
-                'link': 'https://example.com',
-                'displayLink': 'example.com'
-            }
-        ]
+    def test_identify_non_ascii_text_whole_words(self):
+        """Test that ASCII words are not flagged inside accented words"""
+        search_results = [{'title': 'Le résumé de Café', 'snippet': 'sum'}]
 
-        forbidden_words = ['go', 'is']  # Short words
-        search_query = ''
+        results = identify_redacted_terms(
+            search_results, ['sum', 'caf'], '', '')
 
-        redacted = simple_redaction(
-            search_results, forbidden_words, search_query)
+        assert results[0]['redactedTerms']['title'] == []
+        assert results[0]['redactedTerms']['snippet'] == [
+            {'start': 0, 'end': 3, 'word': 'sum'}]
+
+    def test_identify_reuses_public_pattern(self):
+        """Test that a topic already in the forbidden list shares the pattern"""
+        forbidden = ('bitcoin', 'crypto')
+        public = search_utils._get_redaction_pattern(forbidden, 'query')
+        full = search_utils._get_redaction_pattern(
+            forbidden, 'query', 'Bitcoin')
 
-        # Short words should not be redacted
-        assert '[REDACTED]' not in redacted[0]['title']
-        assert '[REDACTED]' not in redacted[0]['snippet']
+        assert full is public
 
 
 class TestRedactWithGemini:
     """Test cases for Gemini AI redaction"""
 
-    @patch('search_utils.GEMINI_AVAILABLE', False)
-    def test_gemini_unavailable_fallback(self):
+    @pytest.fixture(autouse=True)
+    def gemini_client(self, monkeypatch):
+        """Install a mock Gemini client once per test instead of nested patches"""
+        client = Mock()
+        monkeypatch.setattr('search_utils.GEMINI_AVAILABLE', True)
+        monkeypatch.setattr('search_utils.gemini_client', client)
+        monkeypatch.setattr('search_utils.GEMINI_MODEL', 'gemini-flash')
+        monkeypatch.setattr('search_utils._redaction_cache',
+                            search_utils.OrderedDict())
+        return client
+
+    def test_gemini_unavailable_fallback(self, monkeypatch):
         """Test fallback to simple redaction when Gemini unavailable"""
+        monkeypatch.setattr('search_utils.GEMINI_AVAILABLE', False)
         search_results = [
             {
                 'title': 'Bitcoin guide',
@@ -194,27 +329,46 @@ class TestRedactWithGemini:
         # Should use simple redaction as fallback
         assert '[REDACTED]' in redacted[0]['title']
 
-    def test_gemini_redaction_success(self):
-        """Test successful Gemini redaction with mocked model"""
-        # Create a mock model
-        mock_model = Mock()
-        mock_response = Mock()
-        mock_response.text = '''```json
-[
-  {
-    "title": "[REDACTED] guide",
-    "snippet": "Learn about [REDACTED]",
-    "link": "https://example.com",
-    "displayLink": "example.com"
-  }
-]
-```'''
-        mock_model.generate_content.return_value = mock_response
+    def test_gemini_skipped_for_empty_results(self, gemini_client):
+        """Test that an empty result list never reaches Gemini"""
+        redacted = redact_with_gemini(
+            [], ['bitcoin'], 'cryptocurrency', 'Bitcoin')
+
+        assert redacted == []
+        gemini_client.models.generate_content.assert_not_called()
 
+    def test_gemini_redaction_cached(self, gemini_client):
+        """Test that identical redaction requests share one Gemini call"""
+        gemini_client.models.generate_content.return_value.text = \
+            _GEMINI_REDACTION_RESPONSE
         search_results = [
             {
                 'title': 'Bitcoin guide',
-                'snippet': 'Learn about bitcoin',
+                'snippet': 'Learn about BTC',
+                'link': 'https://example.com',
+                'displayLink': 'example.com'
+            }
+        ]
+
+        first = redact_with_gemini(
+            search_results, ['bitcoin'], 'cryptocurrency', 'Bitcoin')
+        second = redact_with_gemini(
+            search_results, ['bitcoin'], 'cryptocurrency', 'Bitcoin')
+
+        assert first == second
+        assert second[0]['snippet'] == 'Learn about [REDACTED]'
+        assert first[0] is not second[0]
+        gemini_client.models.generate_content.assert_called_once()
+
+    def test_gemini_redaction_success(self, monkeypatch):
+        """Test successful Gemini redaction with a stub client"""
+        monkeypatch.setattr('search_utils.gemini_client',
+                            _gemini_stub(_GEMINI_REDACTION_RESPONSE))
+
+        search_results = [
+            {
+                'title': 'Bitcoin guide',
+                'snippet': 'Learn about BTC',
                 'link': 'https://example.com',
                 'displayLink': 'example.com'
             }
@@ -224,24 +378,19 @@ class TestRedactWithGemini:
         search_query = 'cryptocurrency'
         secret_topic = 'Bitcoin'
 
-        # Temporarily patch GEMINI_AVAILABLE and model (create if doesn't exist)
-        with patch('search_utils.GEMINI_AVAILABLE', True):
-            with patch('search_utils.model', mock_model, create=True):
-                redacted = redact_with_gemini(
-                    search_results, forbidden_words, search_query, secret_topic
-                )
+        redacted = redact_with_gemini(
+            search_results, forbidden_words, search_query, secret_topic
+        )
 
         assert len(redacted) == 1
         assert '[REDACTED]' in redacted[0]['title']
         assert '[REDACTED]' in redacted[0]['snippet']
+        assert redacted[0]['link'] == 'https://example.com'
 
-    def test_gemini_redaction_json_error_fallback(self):
+    def test_gemini_redaction_json_error_fallback(self, monkeypatch):
         """Test fallback when Gemini returns invalid JSON"""
-        # Create a mock model that returns invalid JSON
-        mock_model = Mock()
-        mock_response = Mock()
-        mock_response.text = 'Invalid JSON response'
-        mock_model.generate_content.return_value = mock_response
+        monkeypatch.setattr('search_utils.gemini_client',
+                            _gemini_stub('Invalid JSON response'))
 
         search_results = [
             {
@@ -256,87 +405,150 @@ class TestRedactWithGemini:
         search_query = 'cryptocurrency'
         secret_topic = 'Bitcoin'
 
-        # Temporarily patch GEMINI_AVAILABLE and model (create if doesn't exist)
-        with patch('search_utils.GEMINI_AVAILABLE', True):
-            with patch('search_utils.model', mock_model, create=True):
-                # Should fallback to simple redaction on error
-                redacted = redact_with_gemini(
-                    search_results, forbidden_words, search_query, secret_topic
-                )
+        # Should fallback to simple redaction on error
+        redacted = redact_with_gemini(
+            search_results, forbidden_words, search_query, secret_topic
+        )
 
         assert len(redacted) == 1
+        assert redacted[0]['title'] == '[REDACTED] guide'
 
 
 class TestValidateQueryLogic:
     """Test cases for query validation"""
 
-    def test_validate_query_no_violations(self):
-        """Test validation with no forbidden words"""
-        query = 'digital currency online'
-        forbidden_words = ['bitcoin', 'cryptocurrency']
-
+    @pytest.mark.parametrize('query, forbidden_words, expected_valid, expected_violations', [
+        ('digital currency online', ['bitcoin', 'cryptocurrency'], True, []),
+        ('what is bitcoin cryptocurrency', ['bitcoin', 'cryptocurrency'],
+         False, ['bitcoin', 'cryptocurrency']),
+        # Case-insensitive
+        ('What is BITCOIN?', ['bitcoin'], False, ['bitcoin']),
+        # Whole words only: 'bit' must not match 'bitcounter' or 'bitcoin'
+        ('bitcounter is not bitcoin', ['bit'], True, []),
+        ('', ['bitcoin'], True, []),
+        ('test query', [], True, []),
+        ('', [], True, []),
+        # 'moon' should not match 'love' or other words
+        ('I love eating pizza', ['moon'], True, []),
+    ], ids=['no-violations', 'violations', 'case-insensitive', 'whole-word',
+            'empty-query', 'empty-forbidden', 'empty-both', 'partial-match'])
+    def test_validate_query(self, query, forbidden_words, expected_valid,
+                            expected_violations):
+        """Test validation across matching, casing and empty inputs"""
         result = validate_query_logic(query, forbidden_words)
 
-        assert result['valid'] is True
-        assert result['violations'] == []
-        assert 'valid' in result['message'].lower()
+        assert result['valid'] is expected_valid
+        assert set(result['violations']) == set(expected_violations)
+        assert len(result['violations']) == len(expected_violations)
+        if expected_valid and query:
+            assert 'valid' in result['message'].lower()
 
-    def test_validate_query_with_violations(self):
-        """Test validation with forbidden words"""
-        query = 'what is bitcoin cryptocurrency'
-        forbidden_words = ['bitcoin', 'cryptocurrency']
+    def test_validate_query_phrases_and_possessives(self):
+        """Test multi-word entries and possessive forms are caught"""
+        query = "Da Vinci's most famous painting"
+        forbidden_words = ['Da Vinci', 'painting', 'smile']
 
         result = validate_query_logic(query, forbidden_words)
 
         assert result['valid'] is False
-        assert 'bitcoin' in result['violations']
-        assert 'cryptocurrency' in result['violations']
-        assert len(result['violations']) == 2
+        assert result['violations'] == ['Da Vinci', 'painting']
 
-    def test_validate_query_case_insensitive(self):
-        """Test case-insensitive validation"""
-        query = 'What is BITCOIN?'
-        forbidden_words = ['bitcoin']
+    def test_validate_query_overlapping_phrases(self):
+        """Test that phrases sharing words are all reported"""
+        result = validate_query_logic(
+            'da vinci code', ['da vinci', 'vinci code'])
 
-        result = validate_query_logic(query, forbidden_words)
+        assert result['violations'] == ['da vinci', 'vinci code']
 
-        assert result['valid'] is False
-        assert 'bitcoin' in result['violations']
 
-    def test_validate_query_whole_word_match(self):
-        """Test whole word matching"""
-        query = 'bitcounter is not bitcoin'
-        forbidden_words = ['bit']  # Should not match 'bitcounter' or 'bitcoin'
+class TestVerifyGuessWithGemini:
+    """Test cases for guess verification"""
 
-        result = validate_query_logic(query, forbidden_words)
+    @pytest.fixture
+    def gemini_client(self, monkeypatch):
+        """Install a mock Gemini client"""
+        client = Mock()
+        monkeypatch.setattr('search_utils.GEMINI_AVAILABLE', True)
+        monkeypatch.setattr('search_utils.gemini_client', client)
+        monkeypatch.setattr('search_utils.GEMINI_MODEL', 'gemini-flash')
+        return client
 
-        assert result['valid'] is True
-        assert result['violations'] == []
+    @pytest.mark.parametrize('guess, expected', [
+        ('bitcoin', True),
+        ('  BITCOIN ', True),
+        ('what is bitcoin', True),
+        ('bitcion', True),
+        ('pizza', False),
+        ('a very long sentence about something else entirely', False),
+    ])
+    def test_local_check_skips_gemini(self, gemini_client, guess, expected):
+        """Test that obvious hits and misses never reach Gemini"""
+        result = verify_guess_with_gemini(guess, 'Bitcoin')
 
-    def test_validate_query_empty_inputs(self):
-        """Test validation with empty inputs"""
-        result1 = validate_query_logic('', ['bitcoin'])
-        result2 = validate_query_logic('test query', [])
-        result3 = validate_query_logic('', [])
+        assert result['is_correct'] is expected
+        gemini_client.models.generate_content.assert_not_called()
 
-        assert result1['valid'] is True
-        assert result2['valid'] is True
-        assert result3['valid'] is True
+    def test_topic_without_article_matches_locally(self, gemini_client):
+        """Test that dropping a leading article still counts as exact"""
+        result = verify_guess_with_gemini('beatles', 'The Beatles')
 
-    def test_validate_query_partial_match(self):
-        """Test that partial word matches don't trigger violations"""
-        query = 'I love eating pizza'
-        # 'moon' should not match 'love' or other words
-        forbidden_words = ['moon']
+        assert result['is_correct'] is True
+        assert result['similarity_score'] == 1.0
+        gemini_client.models.generate_content.assert_not_called()
 
-        result = validate_query_logic(query, forbidden_words)
+    def test_ambiguous_guess_uses_gemini(self, gemini_client):
+        """Test that guesses in the ambiguous band are sent to Gemini"""
+        gemini_client.models.generate_content.return_value.text = (
+            '{"is_correct": true, "similarity_score": 0.9, "reason": "synonym"}')
 
-        assert result['valid'] is True
+        result = verify_guess_with_gemini('btc coin', 'Bitcoin')
+
+        assert result['is_correct'] is True
+        gemini_client.models.generate_content.assert_called_once()
+
+
+class TestGeminiRateLimit:
+    """Test cases for the Gemini request budget"""
+
+    def test_slot_denied_when_window_full(self, monkeypatch):
+        """Test that a full window is refused instead of waiting too long"""
+        full_window = search_utils.deque(
+            [search_utils.time.time()] * search_utils.GEMINI_MAX_RPM)
+        monkeypatch.setattr('search_utils._gemini_call_times', full_window)
+        monkeypatch.setattr('search_utils.GEMINI_MAX_WAIT', 0)
+
+        assert search_utils._acquire_gemini_slot() is False
+
+    def test_rate_limited_response_backs_off(self, monkeypatch):
+        """Test that a 429 falls back locally and pauses further calls"""
+        error = Exception('quota exceeded')
+        error.code = 429
+        mock_client = Mock()
+        mock_client.models.generate_content.side_effect = error
+        monkeypatch.setattr('search_utils.GEMINI_AVAILABLE', True)
+        monkeypatch.setattr('search_utils.gemini_client', mock_client)
+        monkeypatch.setattr('search_utils.GEMINI_MODEL', 'gemini-flash')
+        monkeypatch.setattr('search_utils._gemini_call_times',
+                            search_utils.deque())
+        monkeypatch.setattr('search_utils._gemini_backoff',
+                            {'until': 0.0, 'delay': 0.0})
+
+        result = verify_guess_with_gemini('btc coin', 'Bitcoin')
+
+        assert search_utils._acquire_gemini_slot() is False
+
+        assert result['reason'] == 'Fallback check due to error'
+        mock_client.models.generate_content.assert_called_once()
 
 
 class TestGetRandomTopicData:
     """Test cases for random topic generation"""
 
+    @pytest.fixture(scope="class")
+    def topic_samples(self, seed_worker_random):
+        """Sample topics after random is seeded so the picks are reproducible"""
+        return [get_random_topic_data() for _ in range(3)]
+
     def test_get_random_topic_structure(self):
         """Test that random topic has correct structure"""
         topic_data = get_random_topic_data()
@@ -348,19 +560,11 @@ class TestGetRandomTopicData:
         assert len(topic_data['topic']) > 0
         assert len(topic_data['forbidden_words']) > 0
 
-    def test_get_random_topic_different_calls(self):
+    def test_get_random_topic_different_calls(self, topic_samples):
         """Test that multiple calls can return different topics"""
-        topics = [get_random_topic_data() for _ in range(10)]
-
-        # Should have valid data
-        for topic_data in topics:
-            assert 'topic' in topic_data
-            assert 'forbidden_words' in topic_data
-            assert len(topic_data['forbidden_words']) > 0
-
-        # All topics should be strings
-        topic_strings = [t['topic'] for t in topics]
-        assert all(isinstance(t, str) for t in topic_strings)
+        for topic_data in topic_samples:
+            assert isinstance(topic_data['topic'], str) and topic_data['topic']
+            assert topic_data['forbidden_words']
 
     def test_get_random_topic_forbidden_words_list(self):
         """Test that forbidden words are non-empty list"""